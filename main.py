@@ -24,35 +24,30 @@ Wybrane opcje menu:
 
 """
 import pygame
+import numpy as np
 import math
 import random
 import json
+import os
+from collections import defaultdict
 import logging
 from datetime import datetime
-import time
+import physics_kernels
 
-class SingletonLogger:
+def _init_logger():
     """
-    Singleton logger for the application.
+    Returns the application logger, adding its file handler only once.
     """
-    _instance = None
+    logger = logging.getLogger("SolarSystemLogger")
+    if not logger.handlers:
+        handler = logging.FileHandler('solar_system.log', encoding='utf-8')
+        formatter = logging.Formatter('%(asctime)s:%(levelname)s:%(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+    return logger
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.logger = logging.getLogger("SolarSystemLogger")
-            handler = logging.FileHandler('solar_system.log', encoding='utf-8')
-            formatter = logging.Formatter('%(asctime)s:%(levelname)s:%(message)s')
-            handler.setFormatter(formatter)
-            cls._instance.logger.addHandler(handler)
-            cls._instance.logger.setLevel(logging.INFO)
-        return cls._instance
-
-    def get_logger(self):
-        return self.logger
-
-# Zamień globalny logger na singleton
-logger = SingletonLogger().get_logger()
+logger = _init_logger()
 
 # Program info
 PROGRAM_INFO = """
@@ -80,6 +75,31 @@ HEIGHT = 1050
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Solar System Simulator")
 
+# Fonts for planet labels (created once instead of every frame)
+NAME_FONT = pygame.font.SysFont(None, 20)
+DIL_FONT = pygame.font.SysFont(None, 16)
+BUTTON_FONT = pygame.font.SysFont(None, 24)
+# Fonts for the indicators and messages
+SPEED_FONT = pygame.font.SysFont(None, 36)
+BH_FONT = pygame.font.SysFont(None, 24)
+ERROR_FONT = pygame.font.SysFont(None, 28)
+WAIT_FONT = pygame.font.SysFont(None, 32)
+CRITICAL_FONT = pygame.font.SysFont(None, 36)
+
+# Rendered text surfaces, keyed by (font, text, color)
+_text_cache = {}
+
+def render_text(font, text, color):
+    """
+    Renders a piece of text once and reuses the surface on later calls.
+    Meant for labels drawn every frame that only take a few distinct values.
+    """
+    key = (font, text, color)
+    surface = _text_cache.get(key)
+    if surface is None:
+        surface = _text_cache[key] = font.render(text, True, color).convert_alpha()
+    return surface
+
 # Define layout constants
 HEADER_HEIGHT = 120
 FOOTER_HEIGHT = 100
@@ -127,6 +147,11 @@ ICON_MINUS = '➖'
 ICON_BH = '⬤'
 ICON_SPEED = '⏩'
 
+# Save file for the simulation state
+STATE_FILE = 'simulation_state.npz'
+# Older JSON save format, still read when there is no .npz save
+LEGACY_STATE_FILE = 'simulation_state.json'
+
 # Global variables
 speed_multiplier = 1.0
 black_hole = None
@@ -136,6 +161,52 @@ black_hole_size = 20
 G = 0.1  # Gravitational constant (scaled for visualization)
 LIGHT_SPEED = 30  # Scaled speed of light for visualization
 EVENT_HORIZON_FACTOR = 2.0  # Schwarzschild radius factor
+BARNES_HUT_THETA = 0.7  # Opening angle for the quadtree approximation
+# Compiled, the tree overtakes the compiled pairwise kernel at about 220 bodies
+# (377us vs 325us at 256); as plain Python it never pays off, so it needs Numba
+BARNES_HUT_MIN_BODIES = 256 if physics_kernels.NUMBA_AVAILABLE else None
+SPATIAL_HASH_MIN_BODIES = 128  # Below this, the dense pairwise collision mask is faster
+PHYSICS_DT = 1 / 60  # Fixed physics timestep in seconds (one step per frame at 60 FPS)
+MAX_PHYSICS_STEPS = 5  # Catch-up limit per frame, e.g. after a blocking message
+
+# Reusable SRCALPHA buffer for translucent circles (grown on demand)
+_alpha_buffer = None
+
+def draw_alpha_circles(surface, center, circles):
+    """
+    Draws concentric translucent circles through a small reusable SRCALPHA buffer.
+    `circles` is a sequence of (rgba_color, radius) drawn in order into the buffer,
+    which is then blended onto the surface at `center`.
+    """
+    global _alpha_buffer
+    max_radius = max(int(radius) for _, radius in circles)
+    if max_radius <= 0:
+        return
+    size = 2 * max_radius + 2
+    if _alpha_buffer is None or _alpha_buffer.get_width() < size:
+        _alpha_buffer = pygame.Surface((size, size), pygame.SRCALPHA)
+    area = pygame.Rect(0, 0, size, size)
+    _alpha_buffer.fill((0, 0, 0, 0), area)
+    local_center = (max_radius + 1, max_radius + 1)
+    for color, radius in circles:
+        pygame.draw.circle(_alpha_buffer, color, local_center, int(radius))
+    surface.blit(_alpha_buffer, (int(center[0]) - max_radius - 1, int(center[1]) - max_radius - 1), area)
+
+def build_glow_sprite(color, radius, layers):
+    """
+    Pre-renders stacked translucent discs into a single SRCALPHA sprite.
+    `layers` is a sequence of (alpha, inset) pairs; each disc has radius `radius - inset`.
+    The sprite is 2*radius+2 pixels wide with the discs centered in it.
+    """
+    size = 2 * radius + 2
+    sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+    layer = pygame.Surface((size, size), pygame.SRCALPHA)
+    center = (radius + 1, radius + 1)
+    for alpha, inset in layers:
+        layer.fill((0, 0, 0, 0))
+        pygame.draw.circle(layer, (*color, alpha), center, radius - inset)
+        sprite.blit(layer, (0, 0))
+    return sprite.convert_alpha()
 
 class Button:
     """
@@ -146,6 +217,9 @@ class Button:
         self.text = text
         self.action = action
         self.is_hovered = False
+        # The label never changes, so it is rendered once
+        self._text_surf = BUTTON_FONT.render(text, True, BUTTON_TEXT).convert_alpha()
+        self._text_pos = self._text_surf.get_rect(center=self.rect.center)
 
     def draw(self, screen):
         """
@@ -153,10 +227,7 @@ class Button:
         """
         color = BUTTON_HOVER if self.is_hovered else BUTTON_COLOR
         pygame.draw.rect(screen, color, self.rect, border_radius=8)
-        font = pygame.font.SysFont(None, 24)
-        text_surface = font.render(self.text, True, BUTTON_TEXT)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        screen.blit(self._text_surf, self._text_pos)
 
     def handle_event(self, event):
         """
@@ -172,6 +243,8 @@ class Sun:
     """
     Represents the Sun in the solar system.
     """
+    __slots__ = ('x', 'y', 'base_radius', 'glow_radius', 'time', 'mass', 'active', '_glow_sprites')
+
     def __init__(self, x, y, radius):
         self.x = x
         self.y = y
@@ -180,6 +253,7 @@ class Sun:
         self.time = 0
         self.mass = radius * 1000  # Sun has much larger mass
         self.active = True  # Add active state for sun
+        self._glow_sprites = {}  # Pre-rendered glow, keyed by outer radius
     
     def draw(self, screen):
         """
@@ -192,20 +266,21 @@ class Sun:
         self.time += 0.05
         pulse = math.sin(self.time) * 8
         
+        # The black hole can pull the sun to fractional coordinates; draw at whole pixels
+        x = int(self.x)
+        y = int(self.y)
         # Animated glow
-        for i in range(8):
-            alpha = 180 - (i * 20)
-            glow_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            radius = self.glow_radius + pulse - (i * 4)
-            pygame.draw.circle(glow_surface, (*SUN_GLOW, alpha), (self.x, self.y), int(radius))
-            screen.blit(glow_surface, (0, 0))
+        radius = int(self.glow_radius + pulse)
+        glow = self._glow_sprites.get(radius)
+        if glow is None:
+            glow = build_glow_sprite(SUN_GLOW, radius, [(180 - (i * 20), i * 4) for i in range(8)])
+            self._glow_sprites[radius] = glow
+        screen.blit(glow, (x - radius - 1, y - radius - 1))
         
         # Sun core
-        pygame.draw.circle(screen, SUN_CORE, (self.x, self.y), self.base_radius)
+        pygame.draw.circle(screen, SUN_CORE, (x, y), self.base_radius)
         # Subtle shadow
-        shadow_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        pygame.draw.circle(shadow_surface, (0,0,0,40), (self.x, self.y+10), self.base_radius+8)
-        screen.blit(shadow_surface, (0,0))
+        draw_alpha_circles(screen, (x, y+10), [((0,0,0,40), self.base_radius+8)])
 
     def check_black_hole_interaction(self, black_hole):
         """
@@ -214,8 +289,10 @@ class Sun:
         if not self.active or not black_hole:
             return False
             
-        distance = math.sqrt((self.x - black_hole.x)**2 + (self.y - black_hole.y)**2)
-        if distance < black_hole.event_horizon + self.base_radius:
+        dx = self.x - black_hole.x
+        dy = self.y - black_hole.y
+        reach = black_hole.event_horizon + self.base_radius
+        if dx*dx + dy*dy < reach*reach:
             self.active = False
             # Massive growth of black hole when absorbing sun
             black_hole.mass += self.mass * 2
@@ -232,44 +309,60 @@ class Sun:
         self.y = HEIGHT//2
         self.active = True
 
-    def affect_planets(self, planets):
+    def affect_planets(self, planet_system):
         """
         Applies gravitational force from the Sun to all planets.
         """
         if not self.active:
             return
-        
-        for planet in planets:
-            if not planet.active:
-                continue
-                
-            dx = planet.orbit_center_offset_x + WIDTH//2 - self.x
-            dy = planet.orbit_center_offset_y + HEIGHT//2 - self.y
-            distance = math.sqrt(dx**2 + dy**2)
-            
-            # Prevent division by zero and handle very close distances
-            if distance < 1:
-                distance = 1
-            elif distance < planet.radius + self.base_radius:
-                # Handle collision with sun
-                planet.active = False
-                # Animacja kolizji ze Słońcem
-                planet.collision_anim_time = 25
-                planet.collision_pos = (int(self.x), int(self.y))
-                continue
-            
-            force = G * self.mass * planet.mass / (distance**2)
-            angle = math.atan2(dy, dx)
-            
-            # Scale force effect for better visualization
-            force_scale = 0.00001
-            planet.velocity_x += math.cos(angle) * force * force_scale
-            planet.velocity_y += math.sin(angle) * force * force_scale
+
+        n = planet_system.count
+        # Scale force effect for better visualization
+        force_scale = 0.00001
+        if physics_kernels.NUMBA_AVAILABLE:
+            # Compiled loop; returns the planets that touch the sun
+            hit = physics_kernels.sun_gravity(
+                planet_system.pos_x[:n], planet_system.pos_y[:n], planet_system.mass[:n],
+                planet_system.radius[:n], planet_system.active[:n], planet_system.vx[:n], planet_system.vy[:n],
+                float(self.x), float(self.y), float(self.base_radius), G * self.mass * force_scale)
+            self._collide_planets(planet_system, hit)
+            return
+
+        dx = planet_system.pos_x[:n] - self.x
+        dy = planet_system.pos_y[:n] - self.y
+        r2 = dx*dx + dy*dy
+        active = planet_system.active[:n]
+
+        # Handle collision with sun (distances below 1 are clamped instead)
+        hit = active & (r2 >= 1) & (r2 < (planet_system.radius[:n] + self.base_radius)**2)
+        self._collide_planets(planet_system, np.flatnonzero(hit))
+
+        # Prevent division by zero and handle very close distances
+        pulled = active & ~hit
+        inv_r = np.maximum(r2, 1.0, out=r2)**-0.5
+        force_over_r = G * self.mass * planet_system.mass[:n] * inv_r*inv_r*inv_r
+        force_over_r *= pulled * force_scale
+        planet_system.vx[:n] += force_over_r * dx
+        planet_system.vy[:n] += force_over_r * dy
+
+    def _collide_planets(self, planet_system, indices):
+        """
+        Deactivates the planets that hit the Sun and starts their collision animation.
+        """
+        for i in indices:
+            planet = planet_system.planets[i]
+            planet.active = False
+            # Animacja kolizji ze Słońcem
+            planet.collision_anim_time = 25
+            planet.collision_pos = (int(self.x), int(self.y))
 
 class BlackHole:
     """
     Represents a Black Hole in the solar system.
     """
+    __slots__ = ('x', 'y', 'radius', 'mass', 'time', 'effect_radius', 'event_horizon', 'absorbed_planets',
+                 'anim_progress', 'anim_spiral', 'anim_planets', 'pull_strength', '_glow_sprites', '_disk_dot')
+
     def __init__(self, x, y, radius):
         self.x = x
         self.y = y
@@ -278,66 +371,30 @@ class BlackHole:
         self.time = 0
         self.effect_radius = radius * 12
         self.event_horizon = self.radius * EVENT_HORIZON_FACTOR
-        self.absorbed_planets = []
-        self.absorption_animations = []
+        self.absorbed_planets = set()  # Planets hash by identity
+        # Spiral absorption animations, one entry per planet (struct of arrays)
+        self.anim_progress = np.empty(0)
+        self.anim_spiral = np.empty(0)
+        self.anim_planets = []
         self.pull_strength = 0.5  # Add pull strength control
+        self._glow_sprites = {}  # Pre-rendered glow, keyed by outer radius
+        self._disk_dot = build_glow_sprite((200, 0, 200), 2, [(255, 0)])
         
-    def calculate_gravity(self, x, y, mass):
+    def start_absorption(self, planet, grow=True):
         """
-        Calculates gravitational force and time dilation effect.
+        Starts absorbing a planet. With grow=False the caller has already added
+        the planet's mass and radius to the black hole.
         """
-        dx = self.x - x
-        dy = self.y - y
-        r = math.sqrt(dx**2 + dy**2)
-        if r < 1: r = 1  # Prevent division by zero
-        
-        # Calculate gravitational force
-        force = G * self.mass * mass / (r * r)
-        
-        # Calculate time dilation effect
-        time_dilation = 1 / math.sqrt(1 - min(0.99, (2 * G * self.mass) / (r * LIGHT_SPEED**2)))
-        
-        return force * dx/r, force * dy/r, time_dilation
-
-    def affect_planet(self, planet, center_x, center_y):
-        """
-        Applies gravitational force and time dilation to a planet.
-        """
-        planet_x = center_x + math.cos(math.radians(planet.angle)) * planet.distance_from_sun
-        planet_y = center_y + math.sin(math.radians(planet.angle)) * planet.distance_from_sun
-        
-        dx = self.x - planet_x
-        dy = self.y - planet_y
-        distance = math.sqrt(dx**2 + dy**2)
-        
-        if distance < self.radius:  # Only absorb if directly touching black hole
-            self.start_absorption(planet)
-            return True
-        
-        # Calculate gravitational force with smoother falloff
-        force = (G * self.mass * planet.mass) / (distance**2)
-        force = min(force, 2.0)  # Limit maximum force
-        
-        angle = math.atan2(dy, dx)
-        pull_x = math.cos(angle) * force * self.pull_strength
-        pull_y = math.sin(angle) * force * self.pull_strength
-        
-        # Update planet's orbit center instead of making it inactive
-        planet.orbit_center_offset_x += pull_x * 0.01
-        planet.orbit_center_offset_y += pull_y * 0.01
-        
-        # Calculate time dilation
-        planet.time_dilation = 1 + (self.mass / (distance * LIGHT_SPEED))
-        
-        return False
-
-    def start_absorption(self, planet):
         if planet not in self.absorbed_planets:
-            self.absorbed_planets.append(planet)
-            # Start spiral absorption animation: [progress, planet, spiral_angle, stretch_factor]
-            self.absorption_animations.append([0.0, planet, random.uniform(0, 2*math.pi), 1.0])
+            self.absorbed_planets.add(planet)
+            # Start spiral absorption animation
+            self.anim_progress = np.append(self.anim_progress, 0.0)
+            self.anim_spiral = np.append(self.anim_spiral, random.uniform(0, 2*math.pi))
+            self.anim_planets.append(planet)
             # Do not immediately deactivate planet
             # planet.active = False  # Usunięte!
+            if not grow:
+                return
             self.mass += planet.mass
             self.radius = math.sqrt(self.radius**2 + planet.radius)
             self.event_horizon = self.radius * EVENT_HORIZON_FACTOR
@@ -346,43 +403,65 @@ class BlackHole:
         self.time += 0.07
         pulse = math.sin(self.time) * 5
         # Animated effect radius
-        for i in range(4):
-            alpha = 120 - (i * 30)
-            glow_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            radius = self.radius + 18 - (i * 5) + pulse
-            pygame.draw.circle(glow_surface, (*BLACK_HOLE_GLOW, alpha), (int(self.x), int(self.y)), int(radius))
-            screen.blit(glow_surface, (0, 0))
-        # Swirling accretion disk
+        radius = int(self.radius + 18 + pulse)
+        glow = self._glow_sprites.get(radius)
+        if glow is None:
+            glow = build_glow_sprite(BLACK_HOLE_GLOW, radius, [(120 - (i * 30), i * 5) for i in range(4)])
+            self._glow_sprites[radius] = glow
+        center_x = int(self.x)
+        center_y = int(self.y)
+        screen.blit(glow, (center_x - radius - 1, center_y - radius - 1))
+        # Swirling accretion disk (one batched blit of a pre-rendered dot)
+        dots = []
         for i in range(12):
             angle = self.time + i * 0.5
             r = self.radius + 22 + 6 * math.sin(angle*2)
             x = int(self.x + r * math.cos(angle))
             y = int(self.y + r * math.sin(angle))
-            pygame.draw.circle(screen, (200, 0, 200, 60), (x, y), 2)
+            dots.append((self._disk_dot, (x - 3, y - 3)))
+        screen.blits(dots, doreturn=False)
         # Black hole core
-        pygame.draw.circle(screen, BLACK_HOLE_COLOR, (int(self.x), int(self.y)), int(self.radius))
+        pygame.draw.circle(screen, BLACK_HOLE_COLOR, (center_x, center_y), int(self.radius))
         # Draw absorption animations (spaghettification)
-        for anim in self.absorption_animations[:]:
-            progress, planet, spiral_angle, stretch = anim
-            if progress < 1.0:
-                # Spiral inwards, stretch planet
-                spiral_r = (1-progress) * 80
-                spiral_theta = spiral_angle + progress * 8 * math.pi
-                px = self.x + math.cos(spiral_theta) * spiral_r
-                py = self.y + math.sin(spiral_theta) * spiral_r
-                # Stretch planet as it approaches
-                stretch = 1 + progress * 4
-                anim[3] = stretch
-                # Draw stretched planet (ellipse)
-                planet_color = tuple(min(255, int(c + 40*progress)) for c in planet.color)
-                ellipse_surface = pygame.Surface((planet.radius*2*stretch, planet.radius*2), pygame.SRCALPHA)
-                pygame.draw.ellipse(ellipse_surface, planet_color, (0, 0, planet.radius*2*stretch, planet.radius*2))
-                screen.blit(ellipse_surface, (int(px-planet.radius*stretch), int(py-planet.radius)))
-                anim[0] += 0.025 + 0.02*progress
-            else:
-                # Deactivate planet after animation
-                planet.active = False
-                self.absorption_animations.remove(anim)
+        if self.anim_planets:
+            self.draw_absorptions(screen)
+
+    def draw_absorptions(self, screen):
+        """
+        Draws and advances all absorption animations, then drops the finished ones.
+        """
+        progress = self.anim_progress
+        running = progress < 1.0
+        # Spiral inwards, stretch planet as it approaches
+        spiral_r = (1-progress) * 80
+        spiral_theta = self.anim_spiral + progress * 8 * math.pi
+        px = self.x + np.cos(spiral_theta) * spiral_r
+        py = self.y + np.sin(spiral_theta) * spiral_r
+        stretch = 1 + progress * 4
+        for k in np.flatnonzero(running):
+            planet = self.anim_planets[k]
+            # Draw stretched planet (ellipse); the color is opaque, so it goes straight onto the screen
+            planet_color = tuple(min(255, int(c + 40*progress[k])) for c in planet.color)
+            pygame.draw.ellipse(screen, planet_color, (int(px[k]-planet.radius*stretch[k]), int(py[k]-planet.radius),
+                                                      planet.radius*2*stretch[k], planet.radius*2))
+        progress[running] += 0.025 + 0.02*progress[running]
+
+        if not running.all():
+            # Deactivate planets after animation and compact the arrays
+            for k in np.flatnonzero(~running):
+                self.anim_planets[k].active = False
+            self.anim_progress = progress[running]
+            self.anim_spiral = self.anim_spiral[running]
+            self.anim_planets = [planet for planet, keep in zip(self.anim_planets, running) if keep]
+
+    def is_absorbing(self, planet):
+        """
+        Checks if the planet's absorption animation is still running.
+        """
+        for other, progress in zip(self.anim_planets, self.anim_progress):
+            if other is planet:
+                return progress < 1.0
+        return False
 
     def affect_sun(self, sun):
         """
@@ -393,44 +472,353 @@ class BlackHole:
             
         dx = self.x - sun.x
         dy = self.y - sun.y
-        distance = math.sqrt(dx**2 + dy**2)
+        r2 = dx*dx + dy*dy
         
-        if distance > 1:  # Prevent division by zero
+        if r2 > 1:  # Prevent division by zero
             # Calculate gravitational force between black hole and sun
-            force = G * self.mass * sun.mass / (distance * distance)
+            inv_r = r2**-0.5
+            force_over_r = G * self.mass * sun.mass * inv_r*inv_r*inv_r
             # Move sun slightly towards black hole
-            sun.x += (dx/distance) * force * 0.0001
-            sun.y += (dy/distance) * force * 0.0001
+            sun.x += force_over_r * dx * 0.0001
+            sun.y += force_over_r * dy * 0.0001
+
+class PlanetSystem:
+    """
+    Stores the numeric state of all planets as NumPy arrays (structure of arrays).
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+        self.planets = []
+        # Current positions, refreshed once per tick by update_positions()
+        self.pos_x = np.empty(capacity, dtype=np.float64)
+        self.pos_y = np.empty(capacity, dtype=np.float64)
+        # Positions at the start of the last tick, and the blend of both that is drawn
+        self.prev_x = np.zeros(capacity, dtype=np.float64)
+        self.prev_y = np.zeros(capacity, dtype=np.float64)
+        self.draw_x = np.zeros(capacity, dtype=np.float64)
+        self.draw_y = np.zeros(capacity, dtype=np.float64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.mass = np.empty(capacity, dtype=np.float64)
+        self.radius = np.empty(capacity, dtype=np.float64)
+        self.active = np.zeros(capacity, dtype=bool)
+        # Orbit parameters the positions are derived from
+        self.distance = np.empty(capacity, dtype=np.float64)
+        self.angle = np.empty(capacity, dtype=np.float64)  # Radians
+        self.offset_x = np.zeros(capacity, dtype=np.float64)
+        self.offset_y = np.zeros(capacity, dtype=np.float64)
+        self.orbital_velocity = np.empty(capacity, dtype=np.float64)
+        self.time_dilation = np.ones(capacity, dtype=np.float64)
+        self.ejected = np.zeros(capacity, dtype=bool)
+        # Collision effect timers
+        self.flash = np.zeros(capacity, dtype=np.float64)
+        self.anim_time = np.zeros(capacity, dtype=np.float64)
+        # Per-tick scratch masks for update()
+        self._skip = np.zeros(capacity, dtype=bool)
+        self._absorbed = np.zeros(capacity, dtype=bool)
+        self._known = np.zeros(capacity, dtype=bool)
+        self._bh_state = np.zeros(2, dtype=np.float64)
+
+    def add(self, planet):
+        """
+        Registers a planet and returns the index of its slot in the arrays.
+        """
+        if self.count >= self.capacity:
+            raise ValueError("PlanetSystem capacity exceeded")
+        index = self.count
+        self.count += 1
+        self.planets.append(planet)
+        return index
+
+    def update_positions(self):
+        """
+        Computes the current screen position of every planet and keeps it as the
+        start of this tick for interpolate_positions().
+        """
+        n = self.count
+        angle = self.angle[:n]
+        self.pos_x[:n] = PANEL_CENTER_X + np.cos(angle) * self.distance[:n] + self.offset_x[:n]
+        self.pos_y[:n] = PANEL_CENTER_Y + np.sin(angle) * self.distance[:n] + self.offset_y[:n]
+        self.prev_x[:n] = self.pos_x[:n]
+        self.prev_y[:n] = self.pos_y[:n]
+
+    def interpolate_positions(self, alpha):
+        """
+        Sets draw_x/draw_y between the positions before and after the last tick.
+        alpha is how far, in ticks, the frame time has run past that tick (0 <= alpha <= 1).
+        """
+        n = self.count
+        self.draw_x[:n] = self.prev_x[:n] + (self.pos_x[:n] - self.prev_x[:n]) * alpha
+        self.draw_y[:n] = self.prev_y[:n] + (self.pos_y[:n] - self.prev_y[:n]) * alpha
+
+    def touching_pairs(self):
+        """
+        Returns the (i, j) index pairs, i < j and in ascending order, of active planets that overlap.
+        Large systems bin planets into a uniform grid and only compare neighbouring cells.
+        """
+        n = self.count
+        x = self.pos_x[:n]
+        y = self.pos_y[:n]
+        radii = self.radius[:n]
+        active = self.active[:n]
+        if n < SPATIAL_HASH_MIN_BODIES:
+            dx = x[None, :] - x[:, None]
+            dy = y[None, :] - y[:, None]
+            touching = np.triu(active[:, None] & active[None, :], k=1)
+            touching &= dx*dx + dy*dy < (radii[:, None] + radii[None, :])**2
+            return list(zip(*(axis.tolist() for axis in np.nonzero(touching))))
+
+        indices = np.flatnonzero(active)
+        if len(indices) < 2:
+            return []
+        # Overlapping planets are closer than two max radii, so they share or neighbour a cell
+        cell = 2 * radii[indices].max()
+        grid = defaultdict(list)
+        cells_x = (x[indices] // cell).astype(np.int64).tolist()
+        cells_y = (y[indices] // cell).astype(np.int64).tolist()
+        for i, gx, gy in zip(indices.tolist(), cells_x, cells_y):
+            grid[gx, gy].append(i)
+        xs, ys, rs = x.tolist(), y.tolist(), radii.tolist()
+        pairs = []
+        for (gx, gy), members in grid.items():
+            # Own cell plus half of the neighbours, so every cell pair is visited once
+            for ox, oy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+                others = members if ox == 0 and oy == 0 else grid.get((gx + ox, gy + oy))
+                if others is None:
+                    continue
+                for a in members:
+                    for b in others:
+                        if others is members and b <= a:
+                            continue
+                        dx = xs[b] - xs[a]
+                        dy = ys[b] - ys[a]
+                        reach = rs[a] + rs[b]
+                        if dx*dx + dy*dy < reach*reach:
+                            pairs.append((a, b) if a < b else (b, a))
+        pairs.sort()
+        return pairs
+
+    def bounce_touching(self):
+        """
+        Flashes every overlapping planet and transfers momentum in one vector pass:
+        each contact reverses and halves the planet's velocity.
+        """
+        pairs = self.touching_pairs()
+        if not pairs:
+            return
+        n = self.count
+        contacts = np.bincount(np.array(pairs).ravel(), minlength=n)
+        # A planet touching k others is bounced k times, as with one pair at a time
+        factor = (-0.5) ** contacts
+        self.vx[:n] *= factor
+        self.vy[:n] *= factor
+        self.flash[:n][contacts > 0] = 1.0
+
+    def apply_gravity(self):
+        """
+        Applies gravitational force between all pairs of active planets in one pass.
+        With Numba, the Barnes-Hut quadtree is used from BARNES_HUT_MIN_BODIES bodies up.
+        """
+        n = self.count
+        if BARNES_HUT_MIN_BODIES is not None and n >= BARNES_HUT_MIN_BODIES:
+            self.apply_gravity_tree()
+            return
+        if physics_kernels.NUMBA_AVAILABLE:
+            # Compiled pairwise loop; touching pairs come back in the same order as below
+            touching = physics_kernels.pairwise_gravity(
+                self.pos_x[:n], self.pos_y[:n], self.mass[:n], self.radius[:n], self.active[:n],
+                self.vx[:n], self.vy[:n], G * 0.0001)
+            for i, j in zip(*touching):
+                # Collision handling
+                self.planets[i].handle_collision(self.planets[j])
+            return
+        x = self.pos_x[:n]
+        y = self.pos_y[:n]
+        # dx[i, j] points from planet i towards planet j
+        dx = x[None, :] - x[:, None]
+        dy = y[None, :] - y[:, None]
+        r2 = dx*dx + dy*dy
+
+        # Each unordered pair once (upper triangle), only between active planets
+        active = self.active[:n]
+        pairs = np.triu(active[:, None] & active[None, :], k=1)
+        radii = self.radius[:n]
+        colliding = pairs & (r2 < (radii[:, None] + radii[None, :])**2)
+        for i, j in zip(*np.nonzero(colliding)):
+            # Collision handling
+            self.planets[i].handle_collision(self.planets[j])
+
+        # Gravitational force, mirrored so both planets of a pair are pulled
+        pulling = pairs & ~colliding
+        pulling |= pulling.T
+        inv_r3 = np.where(pulling, r2, np.inf)**-1.5
+        mass = self.mass[:n]
+        scale = G * mass * 0.0001
+        self.vx[:n] += scale * (mass[None, :] * dx * inv_r3).sum(axis=1)
+        self.vy[:n] += scale * (mass[None, :] * dy * inv_r3).sum(axis=1)
+
+    def apply_gravity_tree(self, theta=BARNES_HUT_THETA):
+        """
+        Applies inter-planet gravity in O(N log N) using a Barnes-Hut quadtree.
+        Touching pairs are found exactly and, as in the dense path, exert no pull.
+        """
+        indices = np.flatnonzero(self.active[:self.count])
+        if len(indices) < 2:
+            return
+        ax, ay, touching = physics_kernels.barnes_hut_gravity(
+            self.pos_x, self.pos_y, self.mass, self.radius, indices, theta)
+        for i, j in touching:
+            # Collision handling
+            self.planets[i].handle_collision(self.planets[j])
+        scale = G * 0.0001
+        self.vx[indices] += scale * self.mass[indices] * ax
+        self.vy[indices] += scale * self.mass[indices] * ay
+
+    def update(self, speed_multiplier, black_hole=None):
+        """
+        Updates all planets' positions and velocities based on their orbits and black hole influence.
+        """
+        n = self.count
+        skip = self._skip[:n]
+        absorbed = self._absorbed[:n]
+        known = self._known[:n]
+        bh_state = self._bh_state
+        skip[:] = False
+        known[:] = False
+        # If being absorbed, skip normal update
+        if black_hole:
+            if black_hole.anim_planets:
+                skip[[planet.index for planet in black_hole.anim_planets]] = black_hole.anim_progress < 1.0
+            for planet in black_hole.absorbed_planets:
+                known[planet.index] = True
+            bh_state[:] = black_hole.radius, black_hole.mass
+            bh_params = (True, float(black_hole.x), float(black_hole.y), bh_state, float(black_hole.effect_radius))
+        else:
+            bh_params = (False, 0.0, 0.0, bh_state, 0.0)
+        physics_kernels.update_planets(
+            self.angle[:n], self.distance[:n], self.offset_x[:n], self.offset_y[:n],
+            self.pos_x[:n], self.pos_y[:n], self.vx[:n], self.vy[:n], self.radius[:n], self.mass[:n],
+            self.active[:n], self.ejected[:n],
+            self.orbital_velocity[:n], self.time_dilation[:n], self.flash[:n], self.anim_time[:n],
+            skip, absorbed, known, float(speed_multiplier), *bh_params,
+            G, PANEL_CENTER_X, PANEL_CENTER_Y, PANEL_LEFT, PANEL_TOP, PANEL_RIGHT, PANEL_BOTTOM)
+        if black_hole and absorbed.any():
+            # The kernel already grew the black hole for each new absorption
+            black_hole.radius = float(bh_state[0])
+            black_hole.mass = float(bh_state[1])
+            black_hole.event_horizon = black_hole.radius * EVENT_HORIZON_FACTOR
+            for i in np.flatnonzero(absorbed):
+                black_hole.start_absorption(self.planets[i], grow=False)
+
+def _system_field(name, cast=float):
+    """
+    Creates a property that reads and writes a planet's slot in a PlanetSystem array.
+    """
+    def getter(self):
+        return cast(getattr(self.system, name)[self.index])
+
+    def setter(self, value):
+        getattr(self.system, name)[self.index] = value
+
+    return property(getter, setter)
 
 # Planet class
 class Planet:
     """
     Represents a planet in the solar system.
+    Numeric state lives in the shared PlanetSystem arrays.
     """
-    def __init__(self, distance_from_sun, radius, color, orbital_period, name, has_rings=False, ring_color=None):
-        self.distance_from_sun = distance_from_sun
+    # Plain attributes only; the array-backed fields below are class-level properties
+    __slots__ = ('system', 'index', 'radius', 'mass', 'color', 'orbital_period', 'name', 'has_rings',
+                 'ring_color', 'original_distance', 'collision_pos', 'initial_distance', 'initial_angle',
+                 '_name_surf', '_name_w', '_last_dil_key', '_dil_surf', '_body_surf', '_ring_sprites')
+
+    distance_from_sun = _system_field('distance')
+    angle = _system_field('angle')
+    orbit_center_offset_x = _system_field('offset_x')
+    orbit_center_offset_y = _system_field('offset_y')
+    velocity_x = _system_field('vx')
+    velocity_y = _system_field('vy')
+    active = _system_field('active', bool)
+    ejected = _system_field('ejected', bool)
+    orbital_velocity = _system_field('orbital_velocity')
+    time_dilation = _system_field('time_dilation')
+    collision_flash = _system_field('flash')
+    collision_anim_time = _system_field('anim_time', int)
+
+    def __init__(self, system, distance_from_sun, radius, color, orbital_period, name, has_rings=False, ring_color=None):
+        self.system = system
+        self.index = i = system.add(self)
+        # Radius and mass never change, so they are plain attributes mirrored into the arrays
         self.radius = radius
+        self.mass = radius * 10  # Mass proportional to radius
+        system.radius[i] = radius
+        system.mass[i] = self.mass
         self.color = color
         self.orbital_period = orbital_period  # In Earth years
-        self.angle = 0
         self.name = name
         self.has_rings = has_rings
         self.ring_color = ring_color
-        self.orbit_center_offset_x = 0
-        self.orbit_center_offset_y = 0
         self.original_distance = distance_from_sun
-        self.velocity_x = 0
-        self.velocity_y = 0
-        self.collision_flash = 0
-        self.collision_anim_time = 0  # czas trwania animacji kolizji
         self.collision_pos = None     # pozycja kolizji
-        self.active = True
-        self.mass = radius * 10  # Mass proportional to radius
-        self.time_dilation = 1.0
-        self.orbital_velocity = math.sqrt(G * 1000 / distance_from_sun)  # Calculate orbital velocity
         self.initial_distance = distance_from_sun
-        self.initial_angle = random.uniform(0, 360)
-        self.angle = self.initial_angle
+        self.initial_angle = random.uniform(0, 2*math.pi)  # Angles are in radians
+        # Numeric state is written straight into the arrays
+        system.distance[i] = distance_from_sun
+        system.angle[i] = self.initial_angle
+        system.offset_x[i] = system.offset_y[i] = 0.0
+        system.vx[i] = system.vy[i] = 0.0
+        system.flash[i] = 0.0
+        system.anim_time[i] = 0.0  # czas trwania animacji kolizji
+        system.active[i] = True
+        system.ejected[i] = False
+        system.time_dilation[i] = 1.0
+        # Calculate orbital velocity (one degree per unit, stored in radians per tick)
+        system.orbital_velocity[i] = math.radians(math.sqrt(G * 1000 / distance_from_sun))
+        # Pre-rendered labels
+        self._name_surf = NAME_FONT.render(name, True, WHITE).convert_alpha()
+        self._name_w = self._name_surf.get_width()
+        self._last_dil_key = None
+        self._dil_surf = None
+        self._body_surf = self._build_body_surface()
+        self._ring_sprites = {}  # Rotated ring sprites, keyed by whole degrees
+
+    def _build_body_surface(self):
+        """
+        Pre-renders the planet's radial gradient into a (2r+2)-pixel SRCALPHA sprite.
+        """
+        size = 2 * self.radius + 2
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        center = (self.radius + 1, self.radius + 1)
+        for i in range(self.radius, 0, -1):
+            color = tuple(min(255, int(c + (self.radius-i)*8)) for c in self.color)
+            pygame.draw.circle(surface, color, center, i)
+        return surface.convert_alpha()
+
+    def orbit_axes(self, center_x, center_y):
+        """
+        Returns the semi-axes (a, b) of the orbital path drawn around (center_x, center_y).
+        """
+        distance = self.system.distance[self.index]
+        if black_hole:
+            # Deform orbit: ellipse based on black hole position
+            dx = black_hole.x - center_x
+            dy = black_hole.y - center_y
+            return int(distance + abs(dx)*0.2), int(distance + abs(dy)*0.2)
+        return int(distance), int(distance)
+
+    def _ring_sprite(self, angle):
+        """
+        Returns the ring sprite rotated by `angle` whole degrees, rendering it on first use.
+        """
+        sprite = self._ring_sprites.get(angle)
+        if sprite is None:
+            ring_surface = pygame.Surface((self.radius*5, self.radius*2), pygame.SRCALPHA)
+            ring_rect = pygame.Rect(self.radius*0.5, self.radius*0.5, self.radius*4, self.radius)
+            pygame.draw.ellipse(ring_surface, self.ring_color, ring_rect, 2)
+            sprite = self._ring_sprites[angle] = pygame.transform.rotate(ring_surface, angle).convert_alpha()
+        return sprite
 
     def reset_position(self):
         """
@@ -448,36 +836,6 @@ class Planet:
         self.collision_pos = None
         self.time_dilation = 1.0
 
-    def apply_gravity_to(self, other_planet):
-        """
-        Applies gravitational force between this planet and another planet.
-        """
-        if not self.active or not other_planet.active:
-            return
-
-        x1 = WIDTH//2 + math.cos(math.radians(self.angle)) * self.distance_from_sun
-        y1 = HEIGHT//2 + math.sin(math.radians(self.angle)) * self.distance_from_sun
-        x2 = WIDTH//2 + math.cos(math.radians(other_planet.angle)) * other_planet.distance_from_sun
-        y2 = HEIGHT//2 + math.sin(math.radians(other_planet.angle)) * other_planet.distance_from_sun
-
-        dx = x2 - x1
-        dy = y2 - y1
-        distance = math.sqrt(dx**2 + dy**2)
-
-        if distance < (self.radius + other_planet.radius):
-            # Collision handling
-            self.handle_collision(other_planet)
-        else:
-            # Gravitational force
-            force = G * self.mass * other_planet.mass / (distance**2)
-            angle = math.atan2(dy, dx)
-            
-            # Apply forces
-            self.velocity_x += math.cos(angle) * force * 0.0001
-            self.velocity_y += math.sin(angle) * force * 0.0001
-            other_planet.velocity_x -= math.cos(angle) * force * 0.0001
-            other_planet.velocity_y -= math.sin(angle) * force * 0.0001
-
     def handle_collision(self, other_planet):
         """
         Handles the collision between two planets.
@@ -489,168 +847,72 @@ class Planet:
         self.collision_anim_time = 20
         other_planet.collision_anim_time = 20
         # Pozycja kolizji (środek między planetami)
-        x1 = PANEL_CENTER_X + math.cos(math.radians(self.angle)) * self.distance_from_sun + self.orbit_center_offset_x
-        y1 = PANEL_CENTER_Y + math.sin(math.radians(self.angle)) * self.distance_from_sun + self.orbit_center_offset_y
-        x2 = PANEL_CENTER_X + math.cos(math.radians(other_planet.angle)) * other_planet.distance_from_sun + other_planet.orbit_center_offset_x
-        y2 = PANEL_CENTER_Y + math.sin(math.radians(other_planet.angle)) * other_planet.distance_from_sun + other_planet.orbit_center_offset_y
-        cx = int((x1 + x2) / 2)
-        cy = int((y1 + y2) / 2)
+        pos_x = self.system.pos_x
+        pos_y = self.system.pos_y
+        cx = int((pos_x[self.index] + pos_x[other_planet.index]) / 2)
+        cy = int((pos_y[self.index] + pos_y[other_planet.index]) / 2)
         self.collision_pos = (cx, cy)
         other_planet.collision_pos = (cx, cy)
 
-    def check_collision(self, other_planet):
-        """
-        Checks if two planets are colliding.
-        """
-        if not self.active or not other_planet.active:
-            return False
-            
-        x1 = WIDTH//2 + math.cos(math.radians(self.angle)) * self.distance_from_sun
-        y1 = HEIGHT//2 + math.sin(math.radians(self.angle)) * self.distance_from_sun
-        x2 = WIDTH//2 + math.cos(math.radians(other_planet.angle)) * other_planet.distance_from_sun
-        y2 = HEIGHT//2 + math.sin(math.radians(other_planet.angle)) * other_planet.distance_from_sun
-        
-        distance = math.sqrt((x2-x1)**2 + (y2-y1)**2)
-        return distance < (self.radius + other_planet.radius)
-
-    def update(self, speed_multiplier, black_hole=None):
-        """
-        Updates the planet's position and velocity based on its orbit and black hole influence.
-        """
-        if not self.active:
-            return
-        # If being absorbed, skip normal update
-        for anim in getattr(black_hole, 'absorption_animations', []) if black_hole else []:
-            if anim[1] is self and anim[0] < 1.0:
-                return
-        effective_speed = speed_multiplier / self.time_dilation
-        self.angle += (self.orbital_velocity * effective_speed)
-        # --- Black hole gravity and slingshot effect ---
-        if black_hole:
-            # Pozycja planety
-            px = PANEL_CENTER_X + math.cos(math.radians(self.angle)) * self.distance_from_sun + self.orbit_center_offset_x
-            py = PANEL_CENTER_Y + math.sin(math.radians(self.angle)) * self.distance_from_sun + self.orbit_center_offset_y
-            dx = black_hole.x - px
-            dy = black_hole.y - py
-            distance = math.sqrt(dx**2 + dy**2)
-            # Jeśli planeta bardzo blisko czarnej dziury, absorpcja
-            if distance < black_hole.radius*1.2:
-                black_hole.start_absorption(self)
-                return
-            # Jeśli planeta przeleci bardzo blisko czarnej dziury, efekt slingshot/wybicia
-            elif distance < black_hole.effect_radius*0.7 and not hasattr(self, 'ejected'):
-                # Oblicz prędkość ucieczki i kierunek
-                v_escape = math.sqrt(2 * G * black_hole.mass / max(distance, 1))
-                angle = math.atan2(dy, dx)
-                # Nadaj planecie nową prędkość (asysta grawitacyjna)
-                self.velocity_x += math.cos(angle) * v_escape * 0.7
-                self.velocity_y += math.sin(angle) * v_escape * 0.7
-                # Zmień orbitę na bardzo wydłużoną (lub trajektorię ucieczki)
-                self.distance_from_sun += random.randint(100, 300)
-                self.orbit_center_offset_x += int(dx * 0.5)
-                self.orbit_center_offset_y += int(dy * 0.5)
-                self.ejected = True  # Flaga, by nie powtarzać efektu
-            # Jeśli planeta już wybita, kontynuuj ruch po trajektorii
-            if hasattr(self, 'ejected') and self.ejected:
-                # Ruch po prostej z zachowaniem pędu
-                self.orbit_center_offset_x += self.velocity_x
-                self.orbit_center_offset_y += self.velocity_y
-                # Jeśli planeta opuści panel, dezaktywuj
-                if (px < PANEL_LEFT-100 or px > PANEL_RIGHT+100 or py < PANEL_TOP-100 or py > PANEL_BOTTOM+100):
-                    self.active = False
-                return
-        else:
-            # Return to normal orbit
-            self.orbit_center_offset_x *= 0.95
-            self.orbit_center_offset_y *= 0.95
-            self.time_dilation = 1.0
-        # Maintain minimum distance from sun
-        min_distance = self.radius + 50
-        if self.distance_from_sun < min_distance:
-            self.distance_from_sun = min_distance
-        if self.collision_flash > 0:
-            self.collision_flash -= 0.1
-        if self.collision_anim_time > 0:
-            self.collision_anim_time -= 1
-
     def draw(self, screen, center_x, center_y):
         """
-        Draws the planet on the screen.
+        Draws the planet on the screen around the orbit center (center_x, center_y).
         """
-        if not self.active:
+        system = self.system
+        i = self.index
+        if not system.active[i]:
             return
         # If being absorbed, skip normal draw (handled by black hole)
-        for anim in getattr(black_hole, 'absorption_animations', []) if 'black_hole' in globals() and black_hole else []:
-            if anim[1] is self and anim[0] < 1.0:
-                return
+        if black_hole and black_hole.is_absorbing(self):
+            return
             
-        # Adjust center based on black hole influence
-        adjusted_center_x = center_x + self.orbit_center_offset_x
-        adjusted_center_y = center_y + self.orbit_center_offset_y
-        
-        x = adjusted_center_x + math.cos(math.radians(self.angle)) * self.distance_from_sun
-        y = adjusted_center_y + math.sin(math.radians(self.angle)) * self.distance_from_sun
-        
-        # Draw orbital path
-        if black_hole:
-            # Deform orbit: ellipse based on black hole position
-            dx = black_hole.x - center_x
-            dy = black_hole.y - center_y
-            orbit_a = int(self.distance_from_sun + abs(dx)*0.2)
-            orbit_b = int(self.distance_from_sun + abs(dy)*0.2)
-            orbit_rect = pygame.Rect(center_x-orbit_a, center_y-orbit_b, 2*orbit_a, 2*orbit_b)
-            pygame.draw.ellipse(screen, (50,50,50), orbit_rect, 1)
-        else:
-            pygame.draw.circle(screen, (50, 50, 50), (center_x, center_y), int(self.distance_from_sun), 1)
+        # Position (including black hole offset) interpolated between physics ticks, in whole pixels
+        x = int(system.draw_x[i])
+        y = int(system.draw_y[i])
         
         # Subtle shadow
-        shadow_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        pygame.draw.circle(shadow_surface, (0,0,0,40), (int(x), int(y+8)), self.radius+3)
-        screen.blit(shadow_surface, (0,0))
+        draw_alpha_circles(screen, (x, y+8), [((0,0,0,40), self.radius+3)])
         # Gradient planet
-        for i in range(self.radius, 0, -1):
-            color = tuple(min(255, int(c + (self.radius-i)*8)) for c in self.color)
-            pygame.draw.circle(screen, color, (int(x), int(y)), i)
+        screen.blit(self._body_surf, (x - self.radius - 1, y - self.radius - 1))
         
         # Draw planet name
-        font = pygame.font.SysFont(None, 20)
-        text = font.render(self.name, True, WHITE)
-        screen.blit(text, (int(x - text.get_width()/2), int(y + self.radius + 5)))
+        screen.blit(self._name_surf, (x - self._name_w//2, y + self.radius + 5))
         
         # Animated rings for Saturn
         if self.has_rings:
-            ring_surface = pygame.Surface((self.radius*5, self.radius*2), pygame.SRCALPHA)
-            ring_angle = math.sin(pygame.time.get_ticks()/400) * 10
-            ring_rect = pygame.Rect(self.radius*0.5, self.radius*0.5, self.radius*4, self.radius)
-            pygame.draw.ellipse(ring_surface, self.ring_color, ring_rect, 2)
-            ring_surface = pygame.transform.rotate(ring_surface, ring_angle)
-            screen.blit(ring_surface, (int(x - ring_surface.get_width()/2), int(y - ring_surface.get_height()/2)))
+            ring_angle = round(math.sin(pygame.time.get_ticks()/400) * 10)
+            ring_surface = self._ring_sprite(ring_angle)
+            screen.blit(ring_surface, (x - ring_surface.get_width()//2, y - ring_surface.get_height()//2))
         
         # Draw collision flash
-        if self.collision_flash > 0:
+        flash = system.flash[i]
+        if flash > 0:
             flash_radius = self.radius + 5
-            alpha = int(255 * self.collision_flash)
-            flash_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            pygame.draw.circle(flash_surface, (*COLLISION_FLASH, alpha), (int(x), int(y)), int(flash_radius))
-            screen.blit(flash_surface, (0, 0))
+            alpha = int(255 * flash)
+            draw_alpha_circles(screen, (x, y), [((*COLLISION_FLASH, alpha), flash_radius)])
         
         # Animacja kolizji (rozbłysk)
-        if self.collision_anim_time > 0 and self.collision_pos:
-            anim_progress = 1 - self.collision_anim_time / 20
+        anim_time = int(system.anim_time[i])
+        if anim_time > 0 and self.collision_pos:
+            anim_progress = 1 - anim_time / 20
             max_radius = self.radius * 4 + 20
             flash_radius = int(max_radius * anim_progress)
             alpha = int(255 * (1 - anim_progress))
-            flash_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            pygame.draw.circle(flash_surface, (255, 220, 0, alpha), self.collision_pos, flash_radius)
-            pygame.draw.circle(flash_surface, (255, 80, 0, int(alpha*0.7)), self.collision_pos, int(flash_radius*0.6))
-            screen.blit(flash_surface, (0, 0))
+            draw_alpha_circles(screen, self.collision_pos, [
+                ((255, 220, 0, alpha), flash_radius),
+                ((255, 80, 0, int(alpha*0.7)), flash_radius*0.6),
+            ])
         
         # Add time dilation indicator
-        if self.time_dilation > 1.1:
-            time_text = f"T×{self.time_dilation:.1f}"
-            font = pygame.font.SysFont(None, 16)
-            text = font.render(time_text, True, (255, 0, 0))
-            screen.blit(text, (int(x - text.get_width()/2), int(y - self.radius - 15)))
+        time_dilation = system.time_dilation[i]
+        if time_dilation > 1.1:
+            # Re-render only when the displayed value changes
+            dil_key = round(time_dilation, 1)
+            if dil_key != self._last_dil_key:
+                self._last_dil_key = dil_key
+                self._dil_surf = DIL_FONT.render(f"T×{time_dilation:.1f}", True, (255, 0, 0)).convert_alpha()
+            text = self._dil_surf
+            screen.blit(text, (x - text.get_width()//2, y - self.radius - 15))
 
 def change_speed(factor):
     """
@@ -695,6 +957,13 @@ def reset_simulation():
         planet.reset_position()
     wait_for_key("Simulation reset! Press any key...")
 
+def load_simulation():
+    """
+    Loads the saved simulation state and replaces the current Black Hole with the loaded one.
+    """
+    global black_hole
+    black_hole = ui_manager.load_state(planet_system, black_hole, sun)
+
 class UIManager:
     """
     Manages the user interface, including drawing headers and saving/loading states.
@@ -703,118 +972,163 @@ class UIManager:
         self.screen = screen
         self.info_font = pygame.font.SysFont(None, 24)
         self.header_font = pygame.font.SysFont(None, 32)
-        
-    def draw_header(self):
+        self._header_surf = self._build_header()
+
+    def _build_header(self):
         """
-        Draws the header at the top of the screen.
+        Renders the static header bar once into an opaque surface.
         """
+        header = pygame.Surface((WIDTH, HEADER_HEIGHT))
         # Pasek informacyjny z tłem
-        pygame.draw.rect(self.screen, HEADER_BG, (0, 0, WIDTH, HEADER_HEIGHT))
+        header.fill(HEADER_BG)
         # Title
         author = self.header_font.render("Solar System Simulator - By Adrian Lesniak", True, HEADER_TEXT)
-        self.screen.blit(author, (10, 10))
+        header.blit(author, (10, 10))
         # Description
         desc = self.info_font.render("A planetary system simulator with black hole, collisions, and time effects.", True, INFO_TEXT)
-        self.screen.blit(desc, (10, 55))
+        header.blit(desc, (10, 55))
         # Instruction (with extra margin)
         instruction = self.info_font.render("After each action, press any key to return to the menu.", True, INFO_TEXT)
-        self.screen.blit(instruction, (10, 85))
+        header.blit(instruction, (10, 85))
         # Usunięto linię 'Menu options:' i listę opcji
+        return header.convert()
+
+    def draw_header(self):
+        """
+        Draws the header at the top of the screen.
+        """
+        self.screen.blit(self._header_surf, (0, 0))
 
-    def save_state(self, planets, black_hole, sun):
+    def save_state(self, planet_system, black_hole, sun):
         """
-        Saves the current simulation state to a JSON file.
+        Saves the current simulation state to a binary NumPy (.npz) file.
         """
         try:
-            state = {
-                'timestamp': str(datetime.now()),
-                'black_hole': {
-                    'exists': black_hole is not None,
-                    'x': black_hole.x if black_hole else 0,
-                    'y': black_hole.y if black_hole else 0,
-                    'radius': black_hole.radius if black_hole else 0
-                },
-                'planets': [(p.distance_from_sun, p.angle, p.active) for p in planets],
-                'sun': {'active': sun.active, 'x': sun.x, 'y': sun.y}
-            }
-            with open('simulation_state.json', 'w') as f:
-                json.dump(state, f)
+            n = planet_system.count
+            np.savez(
+                STATE_FILE,
+                timestamp=np.array(str(datetime.now())),
+                black_hole=np.array([black_hole.x, black_hole.y, black_hole.radius, black_hole.mass] if black_hole else [], dtype=np.float64),
+                planet_distance=planet_system.distance[:n],
+                planet_angle=planet_system.angle[:n],
+                planet_active=planet_system.active[:n],
+                planet_offset=np.stack((planet_system.offset_x[:n], planet_system.offset_y[:n])),
+                planet_velocity=np.stack((planet_system.vx[:n], planet_system.vy[:n])),
+                sun=np.array([sun.active, sun.x, sun.y], dtype=np.float64),
+            )
             logger.info("Simulation state saved successfully")
             wait_for_key("State saved! Press any key...")
         except Exception as e:
-            logger.error(f"Error saving state: {str(e)}")
+            logger.error("Error saving state: %s", e)
 
-    def load_state(self, planets, black_hole, sun):
+    def load_state(self, planet_system, black_hole, sun):
         """
-        Loads a simulation state from a JSON file.
+        Loads a simulation state from a binary NumPy (.npz) file, or from the
+        older JSON save if no .npz file exists.
+        Returns the Black Hole to use afterwards; the current one is kept if loading fails.
         """
+        loaded = black_hole
         try:
-            with open('simulation_state.json', 'r') as f:
-                state = json.load(f)
-                
-            if state['black_hole']['exists']:
-                black_hole = BlackHole(
-                    state['black_hole']['x'],
-                    state['black_hole']['y'],
-                    state['black_hole']['radius']
-                )
-                
-            for planet, (dist, angle, active) in zip(planets, state['planets']):
-                planet.distance_from_sun = dist
-                planet.angle = angle
-                planet.active = active
-                
-            sun.active = state['sun']['active']
-            sun.x = state['sun']['x']
-            sun.y = state['sun']['y']
+            if not os.path.exists(STATE_FILE) and os.path.exists(LEGACY_STATE_FILE):
+                loaded = self._load_legacy_state(planet_system, black_hole, sun)
+            else:
+                loaded = self._load_npz_state(planet_system, black_hole, sun)
             
             logger.info("Simulation state loaded successfully")
             wait_for_key("State loaded! Press any key...")
-            return black_hole
+            return loaded
         except Exception as e:
-            logger.error(f"Error loading state: {str(e)}")
+            logger.error("Error loading state: %s", e)
             wait_for_key("Error loading state! Press any key...")
-            return None
+            return black_hole
+
+    def _load_npz_state(self, planet_system, black_hole, sun):
+        """
+        Reads a STATE_FILE save into the arrays and returns the Black Hole to use.
+        """
+        loaded = black_hole
+        with np.load(STATE_FILE) as state:
+            bh = state['black_hole']
+            if len(bh):
+                bh_x, bh_y, bh_radius, bh_mass = bh.tolist()
+                loaded = BlackHole(bh_x, bh_y, bh_radius)
+                # Restore the mass gained from absorptions
+                loaded.mass = bh_mass
+
+            n = planet_system.count
+            planet_system.distance[:n] = state['planet_distance']
+            planet_system.angle[:n] = state['planet_angle']
+            planet_system.active[:n] = state['planet_active']
+            planet_system.offset_x[:n], planet_system.offset_y[:n] = state['planet_offset']
+            planet_system.vx[:n], planet_system.vy[:n] = state['planet_velocity']
+
+            sun_active, sun.x, sun.y = state['sun'].tolist()
+            sun.active = bool(sun_active)
+
+        return loaded
+
+    def _load_legacy_state(self, planet_system, black_hole, sun):
+        """
+        Reads a LEGACY_STATE_FILE save and returns the Black Hole to use.
+        The JSON format stores planet angles in degrees and no offsets or velocities.
+        """
+        with open(LEGACY_STATE_FILE, 'r') as f:
+            state = json.load(f)
+
+        if state['black_hole']['exists']:
+            black_hole = BlackHole(
+                state['black_hole']['x'],
+                state['black_hole']['y'],
+                state['black_hole']['radius']
+            )
+
+        for planet, (dist, angle, active) in zip(planet_system.planets, state['planets']):
+            i = planet.index
+            planet_system.distance[i] = dist
+            planet_system.angle[i] = math.radians(angle)
+            planet_system.active[i] = active
+
+        sun.active = state['sun']['active']
+        sun.x = state['sun']['x']
+        sun.y = state['sun']['y']
+        return black_hole
 
 # Przesuń przyciski niżej (np. 30px od dołu okna)
 BUTTON_Y_OFFSET = 30
 BUTTON_HEIGHT = 30
 BUTTON_MARGIN = 10
+# Event types Button.handle_event reacts to; other events skip the buttons
+BUTTON_EVENTS = frozenset((pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN))
 
-# Wylicz nową pozycję Y dla przycisków
-def get_button_y(row=0):
-    return HEIGHT - BUTTON_Y_OFFSET - (BUTTON_HEIGHT + BUTTON_MARGIN) * row
+# Wylicz nową pozycję Y dla przycisków (the window is not resizable, so the rows are constants)
+BUTTON_Y_ROW0 = HEIGHT - BUTTON_Y_OFFSET
+BUTTON_Y_ROW1 = BUTTON_Y_ROW0 - (BUTTON_HEIGHT + BUTTON_MARGIN)
 
 # Przypisz przyciski do dwóch rzędów
 # Przyciski bez ikon
 buttons = [
-    Button(10, get_button_y(1), 120, BUTTON_HEIGHT, "Reset BH", reset_black_hole),
-    Button(140, get_button_y(1), 30, BUTTON_HEIGHT, "-", lambda: change_black_hole_size(-5)),
-    Button(180, get_button_y(1), 30, BUTTON_HEIGHT, "+", lambda: change_black_hole_size(5)),
-    Button(220, get_button_y(1), 120, BUTTON_HEIGHT, "Reset All", reset_simulation),
-    Button(400, get_button_y(1), 80, BUTTON_HEIGHT, "Save", lambda: ui_manager.save_state(planets, black_hole, sun)),
-    Button(490, get_button_y(1), 80, BUTTON_HEIGHT, "Load", lambda: setattr(globals(), 'black_hole', ui_manager.load_state(planets, black_hole, sun))),
-    Button(10, get_button_y(0), 80, BUTTON_HEIGHT, "0.5x", lambda: change_speed(0.5)),
-    Button(100, get_button_y(0), 80, BUTTON_HEIGHT, "1x", lambda: change_speed(1.0)),
-    Button(190, get_button_y(0), 80, BUTTON_HEIGHT, "2x", lambda: change_speed(2.0)),
-    Button(280, get_button_y(0), 80, BUTTON_HEIGHT, "5x", lambda: change_speed(5.0))
+    Button(10, BUTTON_Y_ROW1, 120, BUTTON_HEIGHT, "Reset BH", reset_black_hole),
+    Button(140, BUTTON_Y_ROW1, 30, BUTTON_HEIGHT, "-", lambda: change_black_hole_size(-5)),
+    Button(180, BUTTON_Y_ROW1, 30, BUTTON_HEIGHT, "+", lambda: change_black_hole_size(5)),
+    Button(220, BUTTON_Y_ROW1, 120, BUTTON_HEIGHT, "Reset All", reset_simulation),
+    Button(400, BUTTON_Y_ROW1, 80, BUTTON_HEIGHT, "Save", lambda: ui_manager.save_state(planet_system, black_hole, sun)),
+    Button(490, BUTTON_Y_ROW1, 80, BUTTON_HEIGHT, "Load", load_simulation),
+    Button(10, BUTTON_Y_ROW0, 80, BUTTON_HEIGHT, "0.5x", lambda: change_speed(0.5)),
+    Button(100, BUTTON_Y_ROW0, 80, BUTTON_HEIGHT, "1x", lambda: change_speed(1.0)),
+    Button(190, BUTTON_Y_ROW0, 80, BUTTON_HEIGHT, "2x", lambda: change_speed(2.0)),
+    Button(280, BUTTON_Y_ROW0, 80, BUTTON_HEIGHT, "5x", lambda: change_speed(5.0))
 ]
 
-# Add new buttons for save/load
-# buttons.extend([
-#     Button(400, HEIGHT-80, 80, 30, "Save", lambda: ui_manager.save_state(planets, black_hole, sun)),
-#     Button(490, HEIGHT-80, 80, 30, "Load", lambda: setattr(globals(), 'black_hole', ui_manager.load_state(planets, black_hole, sun)))
-# ])
-
 # Create planets with adjusted distances and names
-mercury = Planet(65, 5, GRAY, 0.24, "Mercury")
-venus = Planet(95, 10, ORANGE, 0.62, "Venus")
-earth = Planet(130, 12, BLUE, 1.0, "Earth")
-mars = Planet(165, 8, RED, 1.88, "Mars")
-jupiter = Planet(220, 25, BROWN, 11.86, "Jupiter")
-saturn = Planet(280, 20, ORANGE, 29.46, "Saturn", True, (139, 69, 19))
-uranus = Planet(330, 15, LIGHT_BLUE, 84.01, "Uranus")
-neptune = Planet(380, 15, DARK_BLUE, 164.79, "Neptune")
+planet_system = PlanetSystem(8)
+mercury = Planet(planet_system, 65, 5, GRAY, 0.24, "Mercury")
+venus = Planet(planet_system, 95, 10, ORANGE, 0.62, "Venus")
+earth = Planet(planet_system, 130, 12, BLUE, 1.0, "Earth")
+mars = Planet(planet_system, 165, 8, RED, 1.88, "Mars")
+jupiter = Planet(planet_system, 220, 25, BROWN, 11.86, "Jupiter")
+saturn = Planet(planet_system, 280, 20, ORANGE, 29.46, "Saturn", True, (139, 69, 19))
+uranus = Planet(planet_system, 330, 15, LIGHT_BLUE, 84.01, "Uranus")
+neptune = Planet(planet_system, 380, 15, DARK_BLUE, 164.79, "Neptune")
 
 planets = [mercury, venus, earth, mars, jupiter, saturn, uranus, neptune]
 
@@ -824,157 +1138,177 @@ sun = Sun(PANEL_CENTER_X, PANEL_CENTER_Y, 40)
 # Create UI manager
 ui_manager = UIManager(screen)
 
-# Dodaj zmienną do przechowywania komunikatu o błędzie
-error_message = None
+# Black background with the orbital paths, rebuilt only when a path changes
+_orbit_background = None
+_orbit_key = None
 
-# Add animated background with stars
-def draw_starry_background(surface, star_list):
-    surface.fill((0, 0, 20))
-    for star in star_list:
-        pygame.draw.circle(surface, (255, 255, 255), (int(star[0]), int(star[1])), star[2])
-        star[0] += star[3]
-        if star[0] > WIDTH:
-            star[0] = 0
-            star[1] = random.randint(0, HEIGHT)
+def draw_orbits(surface, planets, center_x, center_y):
+    """
+    Clears the surface to black with the orbital paths of all visible planets drawn in.
+    """
+    global _orbit_background, _orbit_key
+    key = (bool(black_hole), tuple(planet.orbit_axes(center_x, center_y) for planet in planets
+                                   if planet.active and not (black_hole and black_hole.is_absorbing(planet))))
+    if key != _orbit_key:
+        _orbit_key = key
+        _orbit_background = pygame.Surface(surface.get_size())
+        for orbit_a, orbit_b in key[1]:
+            if key[0]:
+                orbit_rect = pygame.Rect(center_x-orbit_a, center_y-orbit_b, 2*orbit_a, 2*orbit_b)
+                pygame.draw.ellipse(_orbit_background, (50,50,50), orbit_rect, 1)
+            else:
+                pygame.draw.circle(_orbit_background, (50, 50, 50), (center_x, center_y), orbit_a, 1)
+        _orbit_background = _orbit_background.convert()
+    surface.blit(_orbit_background, (0, 0))
 
-# Initialize stars for background
-star_list = [[random.randint(0, WIDTH), random.randint(0, HEIGHT), random.randint(1, 2), random.uniform(0.1, 0.5)] for _ in range(150)]
+# Dodaj zmienną do przechowywania komunikatu o błędzie
+error_message = None
 
 # Main game loop
-running = True
 clock = pygame.time.Clock()
 
 def wait_for_key(message="Press any key to return to the menu..."):
-    font = pygame.font.SysFont(None, 32)
-    info = font.render(message, True, (80, 80, 200))
+    info = WAIT_FONT.render(message, True, (80, 80, 200))
     screen.blit(info, (WIDTH//2 - info.get_width()//2, HEIGHT//2))
     pygame.display.flip()
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
-                waiting = False
-        time.sleep(0.05)
-
-while running:
+    # Sleep in SDL until an event arrives instead of polling
+    while True:
+        event = pygame.event.wait()
+        if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
+            break
+        if event.type == pygame.QUIT:
+            # Leave it for the main loop so closing the window still exits
+            pygame.event.post(event)
+            break
+    # The simulation was paused while waiting; do not let the next frame catch up on that time
+    clock.tick()
+
+def step_physics():
+    """
+    Advances the simulation by one fixed physics step.
+    """
+    global error_message
     try:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                if mouse_pos[1] < HEIGHT-100:  # Avoid buttons area
-                    if event.button == 1:  # Left click
-                        try:
-                            create_black_hole(mouse_pos)
-                        except Exception as e:
-                            error_message = f"Error creating black hole: {str(e)}"
-                            logger.error(error_message)
-            # Handle button events
-            for button in buttons:
-                try:
-                    button.handle_event(event)
-                except Exception as e:
-                    error_message = f"Error handling button event: {str(e)}"
-                    logger.error(error_message)
-
-        # Draw animated starry background first
-        draw_starry_background(screen, star_list)
-
-        # Draw a bright panel background and border for the simulation area
-        panel_surface = pygame.Surface((PANEL_WIDTH, PANEL_HEIGHT))
-        panel_surface.fill((245, 245, 255))
-        pygame.draw.rect(panel_surface, (200, 200, 220), (0, 0, PANEL_WIDTH, PANEL_HEIGHT), 4)
-        screen.blit(panel_surface, (PANEL_LEFT, PANEL_TOP))
-
-        try:
-            screen.fill((0, 0, 0))
-            # Draw header
-            ui_manager.draw_header()
-            # Draw indicators
-            font = pygame.font.SysFont(None, 36)
-            speed_text = font.render(f"Speed: {speed_multiplier}x", True, WHITE)
-            bh_font = pygame.font.SysFont(None, 24)
-            bh_text = bh_font.render(f"Black Hole Size: {black_hole_size}", True, WHITE)
-            # Pozycje:
-            speed_x = WIDTH - speed_text.get_width() - 20
-            speed_y = HEIGHT - BUTTON_Y_OFFSET - BUTTON_HEIGHT*2 - 20
-            bh_x = WIDTH - bh_text.get_width() - 20
-            bh_y = speed_y - bh_text.get_height() - 10
-            screen.blit(bh_text, (bh_x, bh_y))
-            screen.blit(speed_text, (speed_x, speed_y))
-        except Exception as e:
-            error_message = f"Error drawing UI: {str(e)}"
-            logger.error(error_message)
+        # Positions are computed once per tick and shared by collisions and gravity
+        planet_system.update_positions()
 
         # Check collisions between planets
-        for i, planet1 in enumerate(planets):
-            for planet2 in planets[i+1:]:
-                try:
-                    if planet1.check_collision(planet2):
-                        planet1.collision_flash = 1.0
-                        planet2.collision_flash = 1.0
-                        # Transfer momentum
-                        planet1.velocity_x = (planet1.velocity_x or 0) * -0.5
-                        planet1.velocity_y = (planet1.velocity_y or 0) * -0.5
-                        planet2.velocity_x = (planet2.velocity_x or 0) * -0.5
-                        planet2.velocity_y = (planet2.velocity_y or 0) * -0.5
-                except Exception as e:
-                    error_message = f"Error handling planet collision: {str(e)}"
-                    logger.error(error_message)
+        planet_system.bounce_touching()
 
         # Update physics
-        try:
-            if sun.active:
-                sun.affect_planets(planets)
-        except Exception as e:
-            error_message = f"Error affecting sun's gravity: {str(e)}"
-            logger.error(error_message)
+        if sun.active:
+            sun.affect_planets(planet_system)
         # Inter-planetary gravity
-        for i, planet1 in enumerate(planets):
-            for planet2 in planets[i+1:]:
-                try:
-                    planet1.apply_gravity_to(planet2)
-                except Exception as e:
-                    error_message = f"Error handling inter-planetary gravity: {str(e)}"
-                    logger.error(error_message)
-        # Draw all objects
+        planet_system.apply_gravity()
+        if black_hole:
+            black_hole.affect_sun(sun)
+            sun.check_black_hole_interaction(black_hole)
+        planet_system.update(speed_multiplier, black_hole)
+    except Exception as e:
+        error_message = f"Error updating physics: {str(e)}"
+        logger.error(error_message)
+
+def main_loop(screen=screen, clock=clock, planets=planets, sun=sun, buttons=buttons, ui_manager=ui_manager,
+              WIDTH=WIDTH, HEIGHT=HEIGHT, WHITE=WHITE, PANEL_CENTER_X=PANEL_CENTER_X, PANEL_CENTER_Y=PANEL_CENTER_Y,
+              BUTTON_Y_OFFSET=BUTTON_Y_OFFSET, BUTTON_HEIGHT=BUTTON_HEIGHT, BUTTON_EVENTS=BUTTON_EVENTS,
+              PHYSICS_DT=PHYSICS_DT, MAX_PHYSICS_STEPS=MAX_PHYSICS_STEPS, planet_system=planet_system):
+    """
+    Runs the game loop until the window is closed.
+    Constants and long-lived objects are bound as default arguments so the loop
+    reads them as locals; state the buttons change (black_hole, speed_multiplier,
+    black_hole_size) is still read from the module globals every frame.
+    """
+    global error_message
+    running = True
+    physics_time = PHYSICS_DT  # Unsimulated time; the first frame takes one step
+    shown_error = None  # Error message currently rendered in err_text
+
+    while running:
         try:
-            if black_hole:
-                black_hole.affect_sun(sun)
-                sun.check_black_hole_interaction(black_hole)
-                black_hole.draw(screen)
-            sun.draw(screen)
-            for planet in planets:
-                planet.update(speed_multiplier, black_hole)
-                planet.draw(screen, PANEL_CENTER_X, PANEL_CENTER_Y)
-        except Exception as e:
-            error_message = f"Error drawing objects: {str(e)}"
-            logger.error(error_message)
-        # Draw buttons last so they're always on top
-        for button in buttons:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    mouse_pos = event.pos  # Position at the time of the click
+                    if mouse_pos[1] < HEIGHT-100:  # Avoid buttons area
+                        if event.button == 1:  # Left click
+                            try:
+                                create_black_hole(mouse_pos)
+                            except Exception as e:
+                                error_message = f"Error creating black hole: {str(e)}"
+                                logger.error(error_message)
+                # Handle button events
+                if event.type in BUTTON_EVENTS:
+                    try:
+                        for button in buttons:
+                            button.handle_event(event)
+                    except Exception as e:
+                        error_message = f"Error handling button event: {str(e)}"
+                        logger.error(error_message)
+
             try:
-                button.draw(screen)
+                # Black background with the orbital paths
+                draw_orbits(screen, planets, PANEL_CENTER_X, PANEL_CENTER_Y)
+                # Draw header
+                ui_manager.draw_header()
+                # Draw indicators
+                speed_text = render_text(SPEED_FONT, f"Speed: {speed_multiplier}x", WHITE)
+                bh_text = render_text(BH_FONT, f"Black Hole Size: {black_hole_size}", WHITE)
+                # Pozycje:
+                speed_x = WIDTH - speed_text.get_width() - 20
+                speed_y = HEIGHT - BUTTON_Y_OFFSET - BUTTON_HEIGHT*2 - 20
+                bh_x = WIDTH - bh_text.get_width() - 20
+                bh_y = speed_y - bh_text.get_height() - 10
+                screen.blit(bh_text, (bh_x, bh_y))
+                screen.blit(speed_text, (speed_x, speed_y))
             except Exception as e:
-                error_message = f"Error drawing button: {str(e)}"
+                error_message = f"Error drawing UI: {str(e)}"
                 logger.error(error_message)
-        # Wyświetl komunikat o błędzie na ekranie, jeśli wystąpił
-        if error_message:
-            err_font = pygame.font.SysFont(None, 28)
-            err_text = err_font.render(error_message, True, (255, 80, 80))
-            screen.blit(err_text, (10, HEIGHT-120))
-        pygame.display.flip()
-        clock.tick(60)
-    except Exception as e:
-        error_message = f"Critical error: {str(e)}"
-        logger.critical(error_message)
-        # Wyświetl błąd na ekranie
-        screen.fill((255, 255, 255))
-        err_font = pygame.font.SysFont(None, 36)
-        err_text = err_font.render(error_message, True, (255, 0, 0))
-        screen.blit(err_text, (10, HEIGHT//2))
-        pygame.display.flip()
-        pygame.time.wait(3000)
-        running = False
 
+            # Advance the physics in fixed steps, independent of the frame rate
+            steps = 0
+            while physics_time >= PHYSICS_DT and steps < MAX_PHYSICS_STEPS:
+                step_physics()
+                physics_time -= PHYSICS_DT
+                steps += 1
+            if steps == MAX_PHYSICS_STEPS:
+                physics_time = 0.0  # Drop the backlog instead of spiralling
+            # Draw planets part of the way into the next tick, so frames with 0 or 2 steps still move evenly
+            planet_system.interpolate_positions(min(physics_time / PHYSICS_DT, 1.0))
+
+            # Draw all objects
+            try:
+                if black_hole:
+                    black_hole.draw(screen)
+                sun.draw(screen)
+                for planet in planets:
+                    planet.draw(screen, PANEL_CENTER_X, PANEL_CENTER_Y)
+                # Draw buttons last so they're always on top
+                for button in buttons:
+                    button.draw(screen)
+            except Exception as e:
+                error_message = f"Error drawing objects: {str(e)}"
+                logger.error(error_message)
+            # Wyświetl komunikat o błędzie na ekranie, jeśli wystąpił
+            if error_message:
+                # The last error stays on screen, so it is rendered only when it changes
+                if error_message != shown_error:
+                    shown_error = error_message
+                    err_text = ERROR_FONT.render(error_message, True, (255, 80, 80)).convert_alpha()
+                screen.blit(err_text, (10, HEIGHT-120))
+            pygame.display.flip()
+        except Exception as e:
+            error_message = f"Critical error: {str(e)}"
+            logger.critical(error_message)
+            # Wyświetl błąd na ekranie
+            screen.fill((255, 255, 255))
+            err_text = CRITICAL_FONT.render(error_message, True, (255, 0, 0))
+            screen.blit(err_text, (10, HEIGHT//2))
+            pygame.display.flip()
+            pygame.time.wait(3000)
+            running = False
+        # Frame pacing stays outside the try so a failed frame still waits for its slot
+        physics_time += clock.tick(60) / 1000
+
+main_loop()
 pygame.quit()
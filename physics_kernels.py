@@ -0,0 +1,391 @@
+"""
+Numeric physics kernels for the Planetary System Simulator.
+
+The functions work on plain floats and NumPy arrays so they can be compiled
+with Numba. Numba is optional: without it the kernels run as normal Python.
+"""
+import math
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        Fallback decorator used when Numba is not installed.
+        """
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def update_planets(angle, distance, offset_x, offset_y, pos_x, pos_y, vx, vy, radius, mass, active, ejected,
+                   orbital_velocity, time_dilation, flash, anim_time, skip, absorbed, known,
+                   speed, has_black_hole, bh_x, bh_y, bh_state, bh_effect_radius,
+                   g, center_x, center_y, left, top, right, bottom):
+    """
+    Advances every planet's orbit and applies the black hole's slingshot effect in place.
+    Planets that touch the black hole are flagged in `absorbed` instead of being updated.
+    The updated positions are written to pos_x/pos_y for drawing.
+
+    bh_state holds the black hole's [radius, mass]. It grows as soon as a planet not in
+    `known` is absorbed, so later planets in the same tick see the bigger black hole.
+    The loop is sequential because of that dependency.
+    """
+    for i in range(angle.shape[0]):
+        absorbed[i] = False
+        # Skip inactive planets and planets that are being absorbed
+        if not active[i] or skip[i]:
+            continue
+        effective_speed = speed / time_dilation[i]
+        angle[i] += orbital_velocity[i] * effective_speed
+        # The angle (in radians) is final for this tick, so its cos/sin are evaluated once
+        cos_a = math.cos(angle[i])
+        sin_a = math.sin(angle[i])
+        # --- Black hole gravity and slingshot effect ---
+        if has_black_hole:
+            # Pozycja planety
+            px = center_x + cos_a * distance[i] + offset_x[i]
+            py = center_y + sin_a * distance[i] + offset_y[i]
+            dx = bh_x - px
+            dy = bh_y - py
+            r2 = dx*dx + dy*dy
+            # Jeśli planeta bardzo blisko czarnej dziury, absorpcja
+            if r2 < (bh_state[0]*1.2)**2:
+                absorbed[i] = True
+                if not known[i]:
+                    known[i] = True
+                    bh_state[1] += mass[i]
+                    bh_state[0] = math.sqrt(bh_state[0]**2 + radius[i])
+                continue
+            # Jeśli planeta przeleci bardzo blisko czarnej dziury, efekt slingshot/wybicia
+            elif r2 < (bh_effect_radius*0.7)**2 and not ejected[i]:
+                # Oblicz prędkość ucieczki i kierunek
+                inv_r = 1.0 / math.sqrt(max(r2, 1.0))
+                v_escape = (2 * g * bh_state[1] * inv_r)**0.5
+                # Nadaj planecie nową prędkość (asysta grawitacyjna)
+                vx[i] += dx * inv_r * v_escape * 0.7
+                vy[i] += dy * inv_r * v_escape * 0.7
+                # Zmień orbitę na bardzo wydłużoną (lub trajektorię ucieczki)
+                distance[i] += np.random.randint(100, 301)
+                offset_x[i] += int(dx * 0.5)
+                offset_y[i] += int(dy * 0.5)
+                ejected[i] = True  # Flaga, by nie powtarzać efektu
+            # Jeśli planeta już wybita, kontynuuj ruch po trajektorii
+            if ejected[i]:
+                # Ruch po prostej z zachowaniem pędu
+                offset_x[i] += vx[i]
+                offset_y[i] += vy[i]
+                # Jeśli planeta opuści panel, dezaktywuj
+                if (px < left-100 or px > right+100 or py < top-100 or py > bottom+100):
+                    active[i] = False
+                pos_x[i] = center_x + cos_a * distance[i] + offset_x[i]
+                pos_y[i] = center_y + sin_a * distance[i] + offset_y[i]
+                continue
+        else:
+            # Return to normal orbit
+            offset_x[i] *= 0.95
+            offset_y[i] *= 0.95
+            time_dilation[i] = 1.0
+        # Maintain minimum distance from sun
+        min_distance = radius[i] + 50
+        if distance[i] < min_distance:
+            distance[i] = min_distance
+        if flash[i] > 0:
+            flash[i] -= 0.1
+        if anim_time[i] > 0:
+            anim_time[i] -= 1
+        pos_x[i] = center_x + cos_a * distance[i] + offset_x[i]
+        pos_y[i] = center_y + sin_a * distance[i] + offset_y[i]
+
+
+@njit(cache=True, fastmath=True)
+def sun_gravity(x, y, mass, radius, active, vx, vy, sun_x, sun_y, sun_radius, scale):
+    """
+    Applies the sun's force dv = scale * m * d / r^3 (d from the sun to the body) in place.
+    Bodies touching the sun feel no force; their indices are returned instead.
+    """
+    n = x.shape[0]
+    hit = np.empty(n, dtype=np.int64)
+    hits = 0
+    for i in range(n):
+        if not active[i]:
+            continue
+        dx = x[i] - sun_x
+        dy = y[i] - sun_y
+        r2 = dx*dx + dy*dy
+        reach = radius[i] + sun_radius
+        # Distances below 1 are clamped instead of counted as a collision
+        if r2 >= 1.0 and r2 < reach*reach:
+            hit[hits] = i
+            hits += 1
+            continue
+        inv_r = 1.0 / math.sqrt(max(r2, 1.0))
+        f = scale * mass[i] * inv_r*inv_r*inv_r
+        vx[i] += f * dx
+        vy[i] += f * dy
+    return hit[:hits]
+
+
+@njit(cache=True, fastmath=True)
+def pairwise_gravity(x, y, mass, radius, active, vx, vy, scale):
+    """
+    Applies gravity between every pair of active bodies in place, with
+    dv_i = scale * m_i * m_j * d / r^3 mirrored onto both bodies of a pair.
+    Touching pairs exert no pull; they are returned as (pair_a, pair_b) with pair_a < pair_b.
+    """
+    n = x.shape[0]
+    # np.empty only reserves memory; pages are touched as pairs are written
+    pair_a = np.empty(n * (n - 1) // 2, dtype=np.int64)
+    pair_b = np.empty(n * (n - 1) // 2, dtype=np.int64)
+    pairs = 0
+    for i in range(n):
+        if not active[i]:
+            continue
+        for j in range(i + 1, n):
+            if not active[j]:
+                continue
+            dx = x[j] - x[i]
+            dy = y[j] - y[i]
+            r2 = dx*dx + dy*dy
+            reach = radius[i] + radius[j]
+            if r2 < reach*reach:
+                pair_a[pairs] = i
+                pair_b[pairs] = j
+                pairs += 1
+                continue
+            inv_r = 1.0 / math.sqrt(r2)
+            f = scale * mass[i] * mass[j] * inv_r*inv_r*inv_r
+            vx[i] += f * dx
+            vy[i] += f * dy
+            vx[j] -= f * dx
+            vy[j] -= f * dy
+    return pair_a[:pairs], pair_b[:pairs]
+
+
+@njit(cache=True)
+def build_quadtree(x, y, mass, bodies, left, top, size, max_depth,
+                   node_left, node_top, node_size, node_mass, node_com_x, node_com_y,
+                   children, leaf_head, body_next):
+    """
+    Builds a Barnes-Hut quadtree over the given body indices into preallocated node arrays.
+    Leaves keep their bodies in a linked list (leaf_head -> body_next); only leaves at
+    max_depth hold more than one body. Returns the node count, or -1 if the arrays are full.
+    """
+    capacity = node_left.shape[0]
+    depth = np.zeros(capacity, dtype=np.int64)
+    node_left[0] = left
+    node_top[0] = top
+    node_size[0] = size
+    children[0, :] = -1
+    leaf_head[0] = -1
+    count = 1
+    for k in range(bodies.shape[0]):
+        b = bodies[k]
+        node = 0
+        while True:
+            half = node_size[node] * 0.5
+            if children[node, 0] != -1:
+                # Internal node: descend into the quadrant holding the body
+                quad = (1 if x[b] >= node_left[node] + half else 0) + (2 if y[b] >= node_top[node] + half else 0)
+                node = children[node, quad]
+                continue
+            other = leaf_head[node]
+            if other == -1 or depth[node] >= max_depth:
+                body_next[b] = other
+                leaf_head[node] = b
+                break
+            # Occupied leaf: split it and push the resident body one level down
+            if count + 4 > capacity:
+                return -1
+            for quad in range(4):
+                child = count + quad
+                node_left[child] = node_left[node] + (half if quad & 1 else 0.0)
+                node_top[child] = node_top[node] + (half if quad & 2 else 0.0)
+                node_size[child] = half
+                children[child, :] = -1
+                leaf_head[child] = -1
+                depth[child] = depth[node] + 1
+                children[node, quad] = child
+            count += 4
+            leaf_head[node] = -1
+            quad = (1 if x[other] >= node_left[node] + half else 0) + (2 if y[other] >= node_top[node] + half else 0)
+            leaf_head[children[node, quad]] = other
+            body_next[other] = -1
+
+    # Mass and center of mass, children before parents (children always have higher ids)
+    for node in range(count - 1, -1, -1):
+        m = 0.0
+        mx = 0.0
+        my = 0.0
+        if children[node, 0] == -1:
+            b = leaf_head[node]
+            while b != -1:
+                m += mass[b]
+                mx += mass[b] * x[b]
+                my += mass[b] * y[b]
+                b = body_next[b]
+        else:
+            for quad in range(4):
+                child = children[node, quad]
+                m += node_mass[child]
+                mx += node_mass[child] * node_com_x[child]
+                my += node_mass[child] * node_com_y[child]
+        node_mass[node] = m
+        # Empty cells get a zero center so 0 * center stays 0 in their parent's sum
+        node_com_x[node] = mx / m if m > 0 else 0.0
+        node_com_y[node] = my / m if m > 0 else 0.0
+    return count
+
+
+@njit(cache=True, fastmath=True)
+def quadtree_forces(x, y, mass, radius, bodies, theta, max_radius, max_depth,
+                    node_left, node_top, node_size, node_mass, node_com_x, node_com_y,
+                    children, leaf_head, body_next, ax, ay, pair_a, pair_b):
+    """
+    Walks the quadtree once per body and accumulates sum(m_j * d / r^3) into ax/ay.
+    Cells whose box lies within r_i + max_radius of the body are always opened, so every
+    touching pair is found exactly, recorded in pair_a/pair_b and left out of the force sum.
+    Returns the number of recorded pairs, or -1 if the pair arrays are full.
+    """
+    theta2 = theta * theta
+    # Depth-first: at most three pending siblings per level plus one set of children
+    stack = np.empty(3 * max_depth + 8, dtype=np.int64)
+    pairs = 0
+    for k in range(bodies.shape[0]):
+        i = bodies[k]
+        xi = x[i]
+        yi = y[i]
+        near = radius[i] + max_radius
+        near2 = near * near
+        fx = 0.0
+        fy = 0.0
+        top_of_stack = 1
+        stack[0] = 0
+        while top_of_stack > 0:
+            top_of_stack -= 1
+            node = stack[top_of_stack]
+            if node_mass[node] == 0:
+                continue
+            if children[node, 0] == -1:
+                # Leaf: exact sum over its bodies
+                j = leaf_head[node]
+                while j != -1:
+                    if j != i:
+                        dx = x[j] - xi
+                        dy = y[j] - yi
+                        r2 = dx*dx + dy*dy
+                        reach = radius[i] + radius[j]
+                        if r2 < reach*reach:
+                            if pairs >= pair_a.shape[0]:
+                                return -1
+                            pair_a[pairs] = i
+                            pair_b[pairs] = j
+                            pairs += 1
+                        else:
+                            inv_r = 1.0 / math.sqrt(r2)
+                            mass_over_r3 = mass[j] * inv_r*inv_r*inv_r
+                            fx += mass_over_r3 * dx
+                            fy += mass_over_r3 * dy
+                    j = body_next[j]
+                continue
+            size = node_size[node]
+            # Distance from the body to the cell's box (0 when inside it)
+            gx = max(node_left[node] - xi, 0.0, xi - node_left[node] - size)
+            gy = max(node_top[node] - yi, 0.0, yi - node_top[node] - size)
+            dx = node_com_x[node] - xi
+            dy = node_com_y[node] - yi
+            r2 = dx*dx + dy*dy
+            if gx*gx + gy*gy >= near2 and size*size < theta2 * r2:
+                # Far enough away: treat the whole cell as one body
+                inv_r = 1.0 / math.sqrt(r2)
+                mass_over_r3 = node_mass[node] * inv_r*inv_r*inv_r
+                fx += mass_over_r3 * dx
+                fy += mass_over_r3 * dy
+            else:
+                for quad in range(4):
+                    stack[top_of_stack] = children[node, quad]
+                    top_of_stack += 1
+        ax[k] = fx
+        ay[k] = fy
+    return pairs
+
+
+def barnes_hut_gravity(x, y, mass, radius, bodies, theta, max_depth=24):
+    """
+    Barnes-Hut approximation of sum_j m_j * (p_j - p_i) / |p_j - p_i|^3 for each body index.
+    Returns (ax, ay, pairs) where pairs is the sorted list of touching (i, j) with i < j;
+    touching pairs are excluded from the sums, matching the dense path.
+    """
+    bx = x[bodies]
+    by = y[bodies]
+    left = bx.min()
+    top = by.min()
+    size = max(bx.max() - left, by.max() - top) * 1.0001 + 1.0
+    n = len(bodies)
+    capacity = 8 * n + 1
+    while True:
+        node_left = np.empty(capacity)
+        node_top = np.empty(capacity)
+        node_size = np.empty(capacity)
+        node_mass = np.empty(capacity)
+        node_com_x = np.empty(capacity)
+        node_com_y = np.empty(capacity)
+        children = np.empty((capacity, 4), dtype=np.int64)
+        leaf_head = np.empty(capacity, dtype=np.int64)
+        body_next = np.empty(x.shape[0], dtype=np.int64)
+        count = build_quadtree(x, y, mass, bodies, left, top, size, max_depth,
+                               node_left, node_top, node_size, node_mass, node_com_x, node_com_y,
+                               children, leaf_head, body_next)
+        if count >= 0:
+            break
+        capacity *= 2
+
+    ax = np.empty(n)
+    ay = np.empty(n)
+    pair_capacity = 4 * n
+    while True:
+        pair_a = np.empty(pair_capacity, dtype=np.int64)
+        pair_b = np.empty(pair_capacity, dtype=np.int64)
+        found = quadtree_forces(x, y, mass, radius, bodies, theta, radius[bodies].max(), max_depth,
+                                node_left, node_top, node_size, node_mass, node_com_x, node_com_y,
+                                children, leaf_head, body_next, ax, ay, pair_a, pair_b)
+        if found >= 0:
+            break
+        pair_capacity *= 4
+
+    # Each touching pair is seen from both sides; keep it once
+    pairs = {(min(a, b), max(a, b)) for a, b in zip(pair_a[:found].tolist(), pair_b[:found].tolist())}
+    return ax, ay, sorted(pairs)
+
+
+if __name__ == "__main__":
+    # Self-check: the Barnes-Hut path must agree with the exact pairwise sum
+    rng = np.random.default_rng(1)
+    for n in (2, 8, 200, 2000):
+        x = rng.uniform(0, 1500, n)
+        y = rng.uniform(0, 1000, n)
+        radius = rng.integers(5, 20, n).astype(np.float64)
+        mass = radius * 10
+        bodies = np.arange(n)
+        ax, ay, pairs = barnes_hut_gravity(x, y, mass, radius, bodies, 0.0)
+
+        dx = x[None, :] - x[:, None]
+        dy = y[None, :] - y[:, None]
+        r2 = dx*dx + dy*dy
+        touching = r2 < (radius[:, None] + radius[None, :])**2
+        np.fill_diagonal(touching, False)
+        inv_r3 = np.where(touching | np.eye(n, dtype=bool), np.inf, r2)**-1.5
+        exact_x = (mass[None, :] * dx * inv_r3).sum(axis=1)
+        exact_y = (mass[None, :] * dy * inv_r3).sum(axis=1)
+        exact_pairs = [(int(i), int(j)) for i, j in zip(*np.nonzero(np.triu(touching)))]
+
+        assert pairs == exact_pairs, n
+        assert np.allclose(ax, exact_x) and np.allclose(ay, exact_y), n
+        ax, ay, _ = barnes_hut_gravity(x, y, mass, radius, bodies, 0.7)
+        error = np.hypot(ax - exact_x, ay - exact_y) / np.hypot(exact_x, exact_y).max()
+        print(f"n={n}: {len(pairs)} touching pairs match, theta=0.7 max relative error {error.max():.2e}")